@@ -1,27 +1,74 @@
+import gc
+import os
+
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 from dash import Dash, dcc, html, Input, Output
-import plotly.express as px
 import plotly.graph_objects as go
 
 # -----------------------------
 # Helpers (make it robust)
 # -----------------------------
 def _normalize_cols(df: pd.DataFrame) -> pd.DataFrame:
-    df = df.copy()
-    df.columns = [c.strip().lower() for c in df.columns]
-    return df
+    # rename() returns a new frame, so the caller's columns are untouched
+    return df.rename(columns=lambda c: c.strip().lower())
 
 def _find_col(df: pd.DataFrame, candidates):
-    cols = set(df.columns)
-    for c in candidates:
-        if c in cols:
-            return c
-    # fallback: partial match
-    for c in df.columns:
-        for cand in candidates:
-            if cand in c:
-                return c
-    return None
+    # normalized name -> actual column, built in one pass
+    cols = {str(c).strip().lower(): c for c in df.columns}
+    for cand in candidates:
+        if cand in cols:
+            return cols[cand]
+    # fallback: partial match (first column, in frame order)
+    return next((c for name, c in cols.items() if any(cand in name for cand in candidates)), None)
+
+def _from_arrow(arr, index) -> pd.Series:
+    # Hand an Arrow array back to pandas without a round-trip through Python objects
+    return pd.Series(arr, index=index, dtype=pd.ArrowDtype(arr.type))
+
+def _daily_by_region(df: pd.DataFrame) -> dict:
+    # Daily sales for every region (and "all") in one bincount pass over a
+    # combined (region, date) label; empty (region, date) cells are dropped
+    labels, dates = pd.factorize(df["date"], sort=True)
+    regions = df["region"].cat.categories
+    codes = df["region"].cat.codes.to_numpy(dtype=np.int64)
+    sales = df["sales"].to_numpy(dtype=np.float64)
+    # NaT date / NaN region come back as -1; skip those and NaN sales, as groupby would
+    ok = (labels >= 0) & (codes >= 0) & ~np.isnan(sales)
+    cells = codes[ok] * len(dates) + labels[ok]
+    shape = (len(regions), len(dates))
+    size = shape[0] * shape[1]
+    totals = np.bincount(cells, weights=sales[ok], minlength=size).reshape(shape)
+    seen = np.bincount(cells, minlength=size).reshape(shape) > 0
+
+    any_seen = seen.any(axis=0)
+    daily = {"all": pd.DataFrame({"date": dates[any_seen], "sales": totals.sum(axis=0)[any_seen]})}
+    for i, r in enumerate(regions):
+        if seen[i].any():
+            daily[r] = pd.DataFrame({"date": dates[seen[i]], "sales": totals[i, seen[i]]})
+    return daily
+
+def _lttb(x, y, n_out):
+    # Largest-Triangle-Three-Buckets downsampling: keeps the first/last point and,
+    # per bucket, the point that best preserves the visual shape of the line
+    n = len(y)
+    if n_out < 3 or n <= n_out:
+        return x, y
+    t = x.astype("datetime64[ns]").astype(np.int64).astype(np.float64)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    keep = [0]
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        nlo, nhi = (edges[i + 1], edges[i + 2]) if i + 2 < len(edges) else (n - 1, n)
+        cx, cy = t[nlo:nhi].mean(), y[nlo:nhi].mean()
+        area = np.abs((t[a] - cx) * (y[lo:hi] - y[a]) - (t[a] - t[lo:hi]) * (cy - y[a]))
+        a = lo + int(np.argmax(area))
+        keep.append(a)
+    keep.append(n - 1)
+    return x[keep], y[keep]
 
 def _empty_figure(message="No data to display"):
     fig = go.Figure()
@@ -46,50 +93,63 @@ def _empty_figure(message="No data to display"):
 # -----------------------------
 # 1) Load formatted data (Task 2 output)
 # -----------------------------
+PARQUET_FILE = "formatted_sales_data.parquet"
 CSV_FILE = "formatted_sales_data.csv"
-raw = pd.read_csv(CSV_FILE)
-df = _normalize_cols(raw)
-
-sales_col = _find_col(df, ["sales"])
-date_col = _find_col(df, ["date"])
-region_col = _find_col(df, ["region"])
-
-# If any required column missing -> still do not crash
-if not all([sales_col, date_col, region_col]):
-    missing = []
-    if not sales_col: missing.append("Sales")
-    if not date_col: missing.append("Date")
-    if not region_col: missing.append("Region")
-    df_clean = None
+missing = []
+
+if os.path.exists(PARQUET_FILE):
+    # Fast path: process_data.py already cleaned + typed this frame
+    df_clean = pd.read_parquet(PARQUET_FILE, engine="pyarrow")
 else:
-    # Rename to standard names
-    df = df.rename(columns={sales_col: "sales", date_col: "date", region_col: "region"})
-
-    # Clean values
-    df["region"] = df["region"].astype(str).str.strip().str.lower()
-
-    # Date parsing
-    df["date"] = pd.to_datetime(df["date"], errors="coerce")
-
-    # Sales numeric parsing (handles commas, €, $, etc.)
-    df["sales"] = (
-        df["sales"]
-        .astype(str)
-        .str.replace(",", "", regex=False)
-        .str.replace("€", "", regex=False)
-        .str.replace("$", "", regex=False)
-        .str.strip()
-    )
-    df["sales"] = pd.to_numeric(df["sales"], errors="coerce")
+    # Fallback: parse and clean the CSV
+    raw = pd.read_csv(CSV_FILE)
+    df = _normalize_cols(raw)
+
+    sales_col = _find_col(df, ["sales"])
+    date_col = _find_col(df, ["date"])
+    region_col = _find_col(df, ["region"])
+
+    # If any required column missing -> still do not crash
+    if not all([sales_col, date_col, region_col]):
+        if not sales_col: missing.append("Sales")
+        if not date_col: missing.append("Date")
+        if not region_col: missing.append("Region")
+        df_clean = None
+    else:
+        # Rename to standard names
+        df = df.rename(columns={sales_col: "sales", date_col: "date", region_col: "region"})
+
+        # Clean values (Arrow UTF-8 kernels instead of .str chains)
+        region = pa.array(df["region"].astype(str))
+        region = pc.utf8_lower(pc.utf8_trim_whitespace(region))
+        df["region"] = _from_arrow(region, df.index).astype("category")
 
-    # Drop unusable rows
-    df_clean = df.dropna(subset=["date", "sales", "region"]).copy()
+        # Date parsing
+        df["date"] = pd.to_datetime(df["date"], errors="coerce")
+
+        # Sales numeric parsing (handles commas, €, $, etc.)
+        sales = pa.array(df["sales"].astype(str))
+        for token in (",", "€", "$"):
+            sales = pc.replace_substring(sales, pattern=token, replacement="")
+        sales = pc.utf8_trim_whitespace(sales)
+        df["sales"] = pd.to_numeric(_from_arrow(sales, df.index), errors="coerce").astype("float32")
+
+        # Drop unusable rows
+        df_clean = df.dropna(subset=["date", "sales", "region"])
+
+# Daily totals per region, built once so callbacks only do a lookup
+# (Task requirement: sorted by date)
+DAILY = _daily_by_region(df_clean) if df_clean is not None else {}
+
+# Peak daily sales per region (y-position of the price increase annotation)
+MAX_SALES = {r: float(daily["sales"].max()) for r, daily in DAILY.items()}
 
 # -----------------------------
 # 2) Create app
 # -----------------------------
 app = Dash(__name__)
 app.title = "Pink Morsels Sales Dashboard"
+server = app.server  # WSGI entry point, e.g. gunicorn app:server
 
 # Regions for radio buttons (Task 4 requirement wants fixed 5 options)
 REGION_OPTIONS = [
@@ -100,6 +160,69 @@ REGION_OPTIONS = [
     {"label": "West", "value": "west"},
 ]
 
+# Price increase marker, parsed once rather than on every callback
+PRICE_INCREASE_DATE = pd.Timestamp("2021-01-15")
+
+# Above this many days the chart is LTTB-downsampled server-side
+# (KPIs still use every day)
+MAX_CHART_POINTS = 2000
+
+# Sales chart skeleton (layout, trace style, price marker) built once;
+# each region's figure copies it and only fills in the trace data
+SALES_FIG = go.Figure(go.Scattergl(x=[], y=[], mode="lines", line=dict(width=2)))
+SALES_FIG.update_layout(
+    title="Pink Morsels Daily Sales (Quantity × Price)",
+    xaxis_title="Date",
+    yaxis_title="Sales",
+    template="plotly_white",
+    margin=dict(l=20, r=20, t=60, b=20),
+    height=520,
+    title_font=dict(size=16),
+)
+# Price increase marker (15 Jan 2021)
+SALES_FIG.add_vline(x=PRICE_INCREASE_DATE, line_dash="dash", line_width=2)
+
+def _build(region_value):
+    # If columns missing, show message
+    if df_clean is None:
+        msg = f"CSV columns missing. Expected: Sales, Date, Region. Missing: {', '.join(missing)}"
+        return _empty_figure(msg).to_dict(), "—", "—", "—"
+
+    daily = DAILY.get(region_value)
+
+    if daily is None or daily.empty:
+        return _empty_figure("No data for this region.").to_dict(), "0", "0", "0"
+
+    total_sales = float(daily["sales"].sum())
+    avg_daily = float(daily["sales"].mean())
+    days = int(daily.shape[0])
+
+    # Copy of the template with this region's data swapped in
+    fig = go.Figure(SALES_FIG)
+    x, y = _lttb(daily["date"].values, daily["sales"].values, MAX_CHART_POINTS)
+    fig.data[0].x = x
+    fig.data[0].y = y
+
+    fig.add_annotation(
+        x=PRICE_INCREASE_DATE,
+        y=MAX_SALES[region_value],
+        text="Price increase (15 Jan 2021)",
+        showarrow=True,
+        arrowhead=2,
+        yshift=20,
+    )
+
+    return (
+        fig.to_dict(),
+        f"{total_sales:,.0f}",
+        f"{avg_daily:,.0f}",
+        f"{days:,}",
+    )
+
+# Figure + KPIs for every region option, built once and shipped to the
+# browser with the layout (see the clientside callback below)
+REGION_RESULTS = {opt["value"]: _build(opt["value"]) for opt in REGION_OPTIONS}
+
 # -----------------------------
 # 3) Layout (Professional UI)
 # -----------------------------
@@ -260,6 +383,9 @@ app.layout = html.Div(
                                     config={"displayModeBar": False},
                                     style={"height": "520px"},
                                 ),
+
+                                # Precomputed figure + KPIs per region
+                                dcc.Store(id="region-results", data=REGION_RESULTS),
                             ],
                         ),
                     ],
@@ -275,71 +401,37 @@ app.layout = html.Div(
 )
 
 # -----------------------------
-# 4) Callback
+# 4) Callback (runs in the browser)
 # -----------------------------
-@app.callback(
+# Region switches just pick the precomputed result out of the store,
+# so no request goes back to the Python server
+app.clientside_callback(
+    """
+    function(region, results) {
+        if (!results || !(region in results)) {
+            throw window.dash_clientside.PreventUpdate;
+        }
+        return results[region];
+    }
+    """,
     Output("sales-chart", "figure"),
     Output("kpi-total", "children"),
     Output("kpi-avg", "children"),
     Output("kpi-days", "children"),
     Input("region-filter", "value"),
+    Input("region-results", "data"),
 )
-def update(region_value):
-    # If columns missing, show message
-    if df_clean is None:
-        msg = f"CSV columns missing. Expected: Sales, Date, Region. Missing: {', '.join(missing)}"
-        return _empty_figure(msg), "—", "—", "—"
 
-    dff = df_clean.copy()
-
-    if region_value != "all":
-        dff = dff[dff["region"] == region_value]
-
-    if dff.empty:
-        return _empty_figure("No data for this region."), "0", "0", "0"
-
-    # Group by day (Task requirement: sorted by date)
-    daily = dff.groupby("date", as_index=False)["sales"].sum().sort_values("date")
-
-    total_sales = float(daily["sales"].sum())
-    avg_daily = float(daily["sales"].mean())
-    days = int(daily.shape[0])
-
-    fig = px.line(
-        daily,
-        x="date",
-        y="sales",
-        title="Pink Morsels Daily Sales (Quantity × Price)",
-        labels={"date": "Date", "sales": "Sales"},
-        template="plotly_white",
-    )
-    fig.update_traces(line=dict(width=2))
-    fig.update_layout(
-        margin=dict(l=20, r=20, t=60, b=20),
-        height=520,
-        title_font=dict(size=16),
-    )
-
-    # Price increase marker (15 Jan 2021)
-    fig.add_vline(x=pd.to_datetime("2021-01-15"), line_dash="dash", line_width=2)
-    fig.add_annotation(
-        x=pd.to_datetime("2021-01-15"),
-        y=max(daily["sales"]),
-        text="Price increase (15 Jan 2021)",
-        showarrow=True,
-        arrowhead=2,
-        yshift=20,
-    )
-
-    return (
-        fig,
-        f"{total_sales:,.0f}",
-        f"{avg_daily:,.0f}",
-        f"{days:,}",
-    )
+# The frames and results above are read-only from here on. Under
+# `gunicorn --preload` they are built once before the fork; freezing them keeps
+# the GC in each worker from writing to (and un-sharing) their pages.
+gc.freeze()
 
 # -----------------------------
 # 5) Run
 # -----------------------------
+# Dev tools + reloader only when asked for (DASH_DEBUG=1)
+DEBUG = os.getenv("DASH_DEBUG", "0") == "1"
+
 if __name__ == "__main__":
-    app.run_server(debug=True)
+    app.run(debug=DEBUG)
@@ -1,29 +1,75 @@
-import pandas as pd
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from pyarrow import csv as pa_csv
 
-# Load files
-df1 = pd.read_csv("data/daily_sales_data_0.csv")
-df2 = pd.read_csv("data/daily_sales_data_1.csv")
-df3 = pd.read_csv("data/daily_sales_data_2.csv")
+FILES = [
+    "data/daily_sales_data_0.csv",
+    "data/daily_sales_data_1.csv",
+    "data/daily_sales_data_2.csv",
+]
 
-# Combine all
-df = pd.concat([df1, df2, df3])
+# Fix every column's type so all streamed batches share one schema (otherwise
+# each file's first block decides, e.g. an all-blank region becomes null).
+# Price and date stay text (cleaned / written out as-is below); quantity fits
+# comfortably in int32
+CONVERT = pa_csv.ConvertOptions(
+    column_types={
+        "product": pa.string(),
+        "price": pa.string(),
+        "quantity": pa.int32(),
+        "date": pa.string(),
+        "region": pa.string(),
+    }
+)
+
+# Stream files batch by batch, keeping only Pink Morsels
+# (peak memory is one batch; dropped rows never reach pandas)
+batches = []
+for path in FILES:
+    for batch in pa_csv.open_csv(path, convert_options=CONVERT):
+        product = pc.utf8_lower(pc.utf8_trim_whitespace(batch["product"]))
+        batches.append(batch.filter(pc.equal(product, "pink morsel")))
 
-# Keep only Pink Morsels
-df = df[df["product"].str.lower() == "pink morsel"]
+# Combine all
+table = pa.Table.from_batches(batches)
 
-# Clean price (remove $ sign)
-df["price"] = df["price"].replace('[\$,]', '', regex=True).astype(float)
+# Clean price (strip leading $ sign and thousands separators; blank -> null)
+price = pc.utf8_ltrim(table["price"], characters="$")
+price = pc.replace_substring(price, pattern=",", replacement="")
+price = pc.if_else(pc.equal(price, ""), pa.scalar(None, pa.string()), price)
+price = pc.cast(price, pa.float64())
 
-# Create Sales column
-df["Sales"] = df["price"] * df["quantity"]
+# Create Sales column (multiply straight into one preallocated buffer);
+# float64 so the CSV keeps full precision, the cache below downcasts
+sales = np.empty(table.num_rows, dtype=np.float64)
+np.multiply(price.to_numpy(), table["quantity"].to_numpy(), out=sales)
 
-# Keep only needed columns
-df = df[["Sales", "date", "region"]]
+# Normalize region once with the same Arrow kernels (blank -> null),
+# dictionary-encoded
+region = pc.utf8_lower(pc.utf8_trim_whitespace(table["region"]))
+region = pc.if_else(pc.equal(region, ""), pa.scalar(None, pa.string()), region)
+region = pc.dictionary_encode(region)
 
-# Rename columns
-df.columns = ["Sales", "Date", "Region"]
+# Keep only needed columns, renamed, and convert to pandas once
+df = pa.table({
+    "Sales": sales,
+    "Date": table["date"],
+    "Region": region,
+}).to_pandas()
 
 # Save final file
 df.to_csv("formatted_sales_data.csv", index=False)
 
-print("DONE — formatted_sales_data.csv created!")
+# Save cleaned + typed copy for the dashboard (no CSV parsing at app start-up),
+# built straight from the Arrow columns; drop_null() drops unusable rows,
+# same as the app's CSV fallback
+clean = pa.table({
+    "sales": pc.cast(pa.array(sales, from_pandas=True), pa.float32()),
+    "date": pc.strptime(table["date"], format="%Y-%m-%d", unit="us", error_is_null=True),
+    "region": region,
+}).drop_null()
+pq.write_table(clean, "formatted_sales_data.parquet", compression="zstd")
+
+print("DONE — formatted_sales_data.csv and formatted_sales_data.parquet created!")
@@ -35,7 +35,7 @@ pip install -q -r requirements.txt
 
 # Run the test suite
 echo "Running test suite..."
-pytest test_app.py -v --headless
+pytest test_app.py test_helpers.py -v --headless
 
 # pytest returns 0 on success, 1 on failure - we pass that through
 exit $?
@@ -0,0 +1,103 @@
+"""
+Unit tests for the data helpers in app.py and the process_data.py script
+(no browser needed).
+"""
+import os
+import runpy
+
+import numpy as np
+import pandas as pd
+
+from app import _daily_by_region, _lttb
+
+
+PROCESS_DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "process_data.py")
+CSV_HEADER = "product,price,quantity,date,region\n"
+
+# 20 days with a few spikes; expected picks come from a reference LTTB
+LTTB_X = np.arange("2021-01-01", "2021-01-21", dtype="datetime64[D]")
+LTTB_Y = np.array([0, 3, 1, 7, 2, 2, 9, 0, 4, 4, 1, 8, 3, 3, 6, 0, 5, 2, 2, 1], dtype=float)
+
+
+def test_lttb_downsamples_to_requested_length():
+    """Verify LTTB returns exactly n_out points and keeps the endpoints."""
+    x, y = _lttb(LTTB_X, LTTB_Y, 6)
+    assert len(x) == len(y) == 6, "Should return n_out points"
+    assert x[0] == LTTB_X[0] and y[0] == LTTB_Y[0], "First point should be kept"
+    assert x[-1] == LTTB_X[-1] and y[-1] == LTTB_Y[-1], "Last point should be kept"
+
+
+def test_lttb_matches_reference_selection():
+    """Verify the selected points match a known-good LTTB result."""
+    x, y = _lttb(LTTB_X, LTTB_Y, 6)
+    expected = [0, 3, 7, 11, 15, 19]
+    assert list(x) == list(LTTB_X[expected]), "Selected dates should match reference LTTB"
+    assert list(y) == list(LTTB_Y[expected]), "Selected values should match reference LTTB"
+
+
+def test_lttb_passes_short_series_through():
+    """Verify series at or below the point budget are returned unchanged."""
+    x, y = _lttb(LTTB_X, LTTB_Y, len(LTTB_Y))
+    assert x is LTTB_X and y is LTTB_Y, "Short series should not be downsampled"
+
+
+def test_daily_by_region_skips_unusable_rows():
+    """Verify NaT dates, NaN regions and NaN sales don't leak into any daily total."""
+    df = pd.DataFrame({
+        "date": pd.to_datetime(["2021-01-01", "2021-01-02", "2021-01-01", None, "2021-01-02", "2021-01-02"]),
+        "sales": [10.0, 20.0, 5.0, 30.0, 7.0, np.nan],
+        "region": pd.Categorical(["north", "north", "south", "south", None, "south"]),
+    })
+    daily = _daily_by_region(df)
+
+    assert list(daily) == ["all", "north", "south"], "Should have 'all' plus each observed region"
+    assert daily["north"]["sales"].tolist() == [10.0, 20.0], "NaT / NaN-region rows must not land on north"
+    assert daily["south"]["date"].tolist() == [pd.Timestamp("2021-01-01")], "NaN sale should not add a south day"
+    assert daily["south"]["sales"].tolist() == [5.0], "South should only total its usable row"
+    assert daily["all"]["sales"].tolist() == [15.0, 20.0], "'all' should only sum usable rows"
+
+
+def _run_process_data(tmp_path, monkeypatch, files):
+    """Run process_data.py against the given daily_sales_data_<i>.csv bodies."""
+    (tmp_path / "data").mkdir()
+    for i, rows in enumerate(files):
+        (tmp_path / "data" / f"daily_sales_data_{i}.csv").write_text(CSV_HEADER + rows)
+    monkeypatch.chdir(tmp_path)
+    runpy.run_path(PROCESS_DATA)
+    return (
+        pd.read_csv("formatted_sales_data.csv", keep_default_na=False),
+        pd.read_parquet("formatted_sales_data.parquet"),
+    )
+
+
+def test_process_data_handles_blank_cells(tmp_path, monkeypatch):
+    """Verify blank price/quantity/date/region cells don't abort the script."""
+    formatted, clean = _run_process_data(tmp_path, monkeypatch, [
+        "pink morsel,$3.00,10,2021-01-01,north\n"
+        "pink morsel,,5,2021-01-02,south\n",
+        "pink morsel,$3.00,,2021-01-03,north\n"
+        "gold morsel,$9.99,1,2021-01-03,north\n",
+        "pink morsel,$3.00,10,,south\n"
+        "pink morsel,$3.00,10,2021-01-04, \n",
+    ])
+
+    assert formatted.values.tolist() == [
+        ["30.0", "2021-01-01", "north"],
+        ["", "2021-01-02", "south"],
+        ["", "2021-01-03", "north"],
+        ["30.0", "", "south"],
+        ["30.0", "2021-01-04", ""],
+    ], "Blank cells should come through as empty values in the formatted CSV"
+    assert clean["sales"].tolist() == [30.0], "Only the fully usable row should reach the Parquet cache"
+
+
+def test_process_data_keeps_one_schema_across_files(tmp_path, monkeypatch):
+    """Verify a file whose region column is all blank still combines with the others."""
+    formatted, clean = _run_process_data(tmp_path, monkeypatch, [
+        "pink morsel,$3.00,10,2021-01-01,north\n",
+        "pink morsel,$3.00,10,2021-01-02,\n",
+        "pink morsel,$5.00,10,2021-01-03,south\n",
+    ])
+
+    assert formatted["Region"].tolist() == ["north", "", "south"], "Blank region should stay empty"
+    assert clean["region"].astype(str).tolist() == ["north", "south"], "Blank-region row should not be cached"